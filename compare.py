@@ -1,4 +1,8 @@
 import logging
+from collections import deque
+from typing import Any, TypeVar
+from collections.abc import Callable, Hashable
+from operator import attrgetter
 from svdsuite.model.process import (
     Peripheral,
     Interrupt,
@@ -11,104 +15,225 @@ from svdsuite.model.process import (
 )
 
 logger = logging.getLogger(__name__)
+_warn = logger.warning
+
+T = TypeVar("T")
+
+# Can't compare reset values and masks of peripherals and registers do to a bug in svdconv
+_PERIPHERAL_ATTRIBUTES = (
+    "name",
+    "version",
+    "alternate_peripheral",
+    "group_name",
+    "prepend_to_name",
+    "append_to_name",
+    "header_struct_name",
+    "base_address",
+    "size",
+    "access",
+    "protection",
+)
+
+_ADDRESS_BLOCK_ATTRIBUTES = ("offset", "size", "usage", "protection")
+
+_INTERRUPT_ATTRIBUTES = ("name", "value")
+
+_REGISTER_ATTRIBUTES = (
+    "name",
+    "display_name",
+    "alternate_group",
+    "alternate_register",
+    "address_offset",
+    "data_type",
+    "modified_write_values",
+    "read_action",
+    "size",
+    "access",
+    "protection",
+    "base_address",
+)
+
+# bug in SVDConv? header_struct_name is not compared
+_CLUSTER_ATTRIBUTES = (
+    "name",
+    "alternate_cluster",
+    "address_offset",
+    "size",
+    "access",
+    "protection",
+    "reset_value",
+    "reset_mask",
+    "base_address",
+)
+
+_FIELD_ATTRIBUTES = (
+    "name",
+    "lsb",
+    "msb",
+    "bit_offset",
+    "bit_width",
+    "bit_range",
+    "modified_write_values",
+    "read_action",
+    "access",
+)
+
+_ENUMERATED_VALUE_CONTAINER_ATTRIBUTES = ("name", "header_enum_name", "usage")
+
+_ENUMERATED_VALUE_ATTRIBUTES = ("name", "value")
+
+_peripheral_key = attrgetter(*_PERIPHERAL_ATTRIBUTES)
+_address_block_key = attrgetter(*_ADDRESS_BLOCK_ATTRIBUTES)
+_interrupt_key = attrgetter(*_INTERRUPT_ATTRIBUTES)
+_register_key = attrgetter(*_REGISTER_ATTRIBUTES)
+_cluster_key = attrgetter(*_CLUSTER_ATTRIBUTES)
+_field_key = attrgetter(*_FIELD_ATTRIBUTES)
+_enumerated_value_container_key = attrgetter(*_ENUMERATED_VALUE_CONTAINER_ATTRIBUTES)
+_enumerated_value_key = attrgetter(*_ENUMERATED_VALUE_ATTRIBUTES)
+
+# children are matched by these keys instead of by position; (dim expanded) names alone are not always unique
+_register_cluster_match_key = attrgetter("name", "address_offset")
+_field_match_key = attrgetter("name", "lsb")
+_enumerated_value_container_match_key = attrgetter("name", "usage")
+
+
+def _peripheral_fingerprint(peripheral: Peripheral) -> tuple[str, int, int]:
+    return peripheral.name, peripheral.base_address, len(peripheral.registers_clusters)
 
 
 class Compare:
     def __init__(self, svdconv_peripherals: list[Peripheral], svdsuite_peripherals: list[Peripheral]):
         self._svdconv_peripherals = svdconv_peripherals
         self._svdsuite_peripherals = svdsuite_peripherals
+        self._tree_keys: dict[int, tuple[object, ...]] = {}
 
     def compare(self) -> bool:
-        return self._compare_peripherals()
-
-    def _compare_peripherals(self) -> bool:
-        if len(self._svdconv_peripherals) != len(self._svdsuite_peripherals):
-            logger.warning(
-                "Peripherals count mismatch: %s != %s", len(self._svdconv_peripherals), len(self._svdsuite_peripherals)
-            )
+        if not self._compare_summary():
             return False
 
-        for peri_c, peri_s in zip(self._svdconv_peripherals, self._svdsuite_peripherals):
-            if peri_c.name != peri_s.name:
-                logger.warning("Name mismatch: %s != %s", peri_c.name, peri_s.name)
-                return False
+        # the model classes compare all of their attributes (including the parsed svd elements), so both trees are
+        # reduced to nested tuples of the compared attributes and checked with a single ==; this decides the result,
+        # the element-wise walk only runs to log the first difference
+        if list(map(self._tree_key, self._svdconv_peripherals)) == list(
+            map(self._tree_key, self._svdsuite_peripherals)
+        ):
+            return True
 
-            if peri_c.version != peri_s.version:
-                logger.warning("Version mismatch: %s != %s", peri_c.version, peri_s.version)
-                return False
+        if self._compare_peripherals() and logger.isEnabledFor(logging.WARNING):
+            _warn("Peripherals mismatch, but the element-wise comparison found no difference")
 
-            if peri_c.alternate_peripheral != peri_s.alternate_peripheral:
-                logger.warning(
-                    "Alternate peripheral mismatch: %s != %s", peri_c.alternate_peripheral, peri_s.alternate_peripheral
-                )
-                return False
+        return False
 
-            if peri_c.group_name != peri_s.group_name:
-                logger.warning("Group name mismatch: %s != %s", peri_c.group_name, peri_s.group_name)
-                return False
+    def _compare_summary(self) -> bool:
+        # O(peripherals) checks that fail fast before the tree keys are built
+        if len(self._svdconv_peripherals) != len(self._svdsuite_peripherals):
+            return self._log_count_mismatch("Peripherals", self._svdconv_peripherals, self._svdsuite_peripherals)
+
+        # names, base addresses and register/cluster counts only touch the peripherals; if they differ, the trees can't
+        # be equal and the element-wise walk runs right away to log the first difference
+        if list(map(_peripheral_fingerprint, self._svdconv_peripherals)) != list(
+            map(_peripheral_fingerprint, self._svdsuite_peripherals)
+        ):
+            self._compare_peripherals()
+            return False
 
-            if peri_c.prepend_to_name != peri_s.prepend_to_name:
-                logger.warning("Prepend to name mismatch: %s != %s", peri_c.prepend_to_name, peri_s.prepend_to_name)
-                return False
+        return True
 
-            if peri_c.append_to_name != peri_s.append_to_name:
-                logger.warning("Append to name mismatch: %s != %s", peri_c.append_to_name, peri_s.append_to_name)
-                return False
+    # the _log_* helpers only run on the mismatch path and skip building the message if warnings are disabled
+    def _log_count_mismatch(self, label: str, items_c: list[Any], items_s: list[Any]) -> bool:
+        if logger.isEnabledFor(logging.WARNING):
+            _warn("%s count mismatch: %s != %s", label, len(items_c), len(items_s))
 
-            if peri_c.header_struct_name != peri_s.header_struct_name:
-                logger.warning(
-                    "Header struct name mismatch: %s != %s", peri_c.header_struct_name, peri_s.header_struct_name
-                )
-                return False
+        return False
 
-            if peri_c.base_address != peri_s.base_address:
-                logger.warning("Base address mismatch: %s != %s", peri_c.base_address, peri_s.base_address)
-                return False
+    def _log_attribute_mismatch(self, prefix: str, attributes: tuple[str, ...], obj_c: object, obj_s: object) -> bool:
+        if not logger.isEnabledFor(logging.WARNING):
+            return False
 
-            if len(peri_c.address_blocks) != len(peri_s.address_blocks):
-                logger.warning(
-                    "Address blocks count mismatch: %s != %s", len(peri_c.address_blocks), len(peri_s.address_blocks)
+        # only called after the attribute tuples compared unequal, so one of the attributes must differ
+        for attribute in attributes:
+            value_c = getattr(obj_c, attribute)
+            value_s = getattr(obj_s, attribute)
+            if value_c != value_s:
+                label = f"{prefix} {attribute.replace('_', ' ')}".strip().capitalize()
+                _warn("%s mismatch: %s != %s", label, value_c, value_s)
+                break
+
+        return False
+
+    def _pair_by_key(
+        self, label: str, items_c: list[T], items_s: list[T], key: Callable[[T], Hashable]
+    ) -> None | list[tuple[T, T]]:
+        by_key_c = {key(item): item for item in items_c}
+        by_key_s = {key(item): item for item in items_s}
+
+        if len(by_key_c) != len(items_c) or len(by_key_s) != len(items_s):
+            # duplicate keys, fall back to matching by position
+            if len(items_c) != len(items_s):
+                self._log_count_mismatch(label, items_c, items_s)
+                return None
+
+            return list(zip(items_c, items_s))
+
+        if by_key_c.keys() != by_key_s.keys():
+            if logger.isEnabledFor(logging.WARNING):
+                _warn(
+                    "%s mismatch: only in svdconv: %s, only in svdsuite: %s",
+                    label,
+                    [k for k in by_key_c if k not in by_key_s],
+                    [k for k in by_key_s if k not in by_key_c],
                 )
-                return False
-
-            if not self._compare_address_blocks(peri_c.address_blocks, peri_s.address_blocks):
-                return False
-
-            if len(peri_c.interrupts) != len(peri_s.interrupts):
-                logger.warning("Interrupts count mismatch: %s != %s", len(peri_c.interrupts), len(peri_s.interrupts))
-                return False
-
-            if not self._compare_interrupts(peri_c.interrupts, peri_s.interrupts):
-                return False
+            return None
+
+        # matching by key only helps to name added or missing children; the trees are ordered, so a different order is
+        # still a mismatch
+        if list(by_key_c) != list(by_key_s):
+            if logger.isEnabledFor(logging.WARNING):
+                _warn("%s order mismatch: %s != %s", label, list(by_key_c), list(by_key_s))
+            return None
+
+        return [(item_c, by_key_s[k]) for k, item_c in by_key_c.items()]
+
+    def _tree_key(self, node: Peripheral | Register | Cluster | Field | EnumeratedValueContainer) -> tuple[object, ...]:
+        # nested tuple of the compared attributes of a node and all of its children, memoized per node so that the
+        # element-wise walk reuses the subtree keys built by compare() instead of building them again
+        node_id = id(node)
+        tree_key = self._tree_keys.get(node_id)
+        if tree_key is not None:
+            return tree_key
+
+        if isinstance(node, Register):
+            tree_key = (Register, _register_key(node), tuple(map(self._tree_key, node.fields)))
+        elif isinstance(node, Cluster):
+            tree_key = (Cluster, _cluster_key(node), tuple(map(self._tree_key, node.registers_clusters)))
+        elif isinstance(node, Field):
+            tree_key = (_field_key(node), tuple(map(self._tree_key, node.enumerated_value_containers)))
+        elif isinstance(node, EnumeratedValueContainer):
+            tree_key = (
+                _enumerated_value_container_key(node),
+                tuple(map(_enumerated_value_key, node.enumerated_values)),
+            )
+        else:
+            tree_key = (
+                _peripheral_key(node),
+                tuple(map(_address_block_key, node.address_blocks)),
+                tuple(map(_interrupt_key, node.interrupts)),
+                tuple(map(self._tree_key, node.registers_clusters)),
+            )
 
-            if peri_c.size != peri_s.size:
-                logger.warning("Size mismatch: %s != %s", peri_c.size, peri_s.size)
-                return False
+        self._tree_keys[node_id] = tree_key
+        return tree_key
 
-            if peri_c.access != peri_s.access:
-                logger.warning("Access mismatch: %s != %s", peri_c.access, peri_s.access)
-                return False
+    def _compare_peripherals(self) -> bool:
+        # the peripherals count is already checked by _compare_summary
+        for peri_c, peri_s in zip(self._svdconv_peripherals, self._svdsuite_peripherals):
+            if _peripheral_key(peri_c) != _peripheral_key(peri_s):
+                return self._log_attribute_mismatch("", _PERIPHERAL_ATTRIBUTES, peri_c, peri_s)
 
-            if peri_c.protection != peri_s.protection:
-                logger.warning("Protection mismatch: %s != %s", peri_c.protection, peri_s.protection)
+            if not self._compare_address_blocks(peri_c.address_blocks, peri_s.address_blocks):
                 return False
 
-            # Can't compare reset values and masks do to a bug in svdconv
-
-            # if peri_c.reset_value != peri_s.reset_value:
-            #     logger.warning("Reset value mismatch: %s != %s", peri_c.reset_value, peri_s.reset_value)
-            #     return False
-
-            # if peri_c.reset_mask != peri_s.reset_mask:
-            #     logger.warning("Reset mask mismatch: %s != %s", peri_c.reset_mask, peri_s.reset_mask)
-            #     return False
-
-            if len(peri_c.registers_clusters) != len(peri_s.registers_clusters):
-                logger.warning(
-                    "Registers clusters count mismatch: %s != %s",
-                    len(peri_c.registers_clusters),
-                    len(peri_s.registers_clusters),
-                )
+            if not self._compare_interrupts(peri_c.interrupts, peri_s.interrupts):
                 return False
 
             if not self._compare_registers_clusters(peri_c.registers_clusters, peri_s.registers_clusters):
@@ -119,245 +244,89 @@ class Compare:
     def _compare_address_blocks(
         self, address_blocks_c: list[AddressBlock], address_blocks_s: list[AddressBlock]
     ) -> bool:
-        for ab_c, ab_s in zip(address_blocks_c, address_blocks_s):
-            if ab_c.offset != ab_s.offset:
-                logger.warning("Address block offset mismatch: %s != %s", ab_c.offset, ab_s.offset)
-                return False
+        if list(map(_address_block_key, address_blocks_c)) == list(map(_address_block_key, address_blocks_s)):
+            return True
 
-            if ab_c.size != ab_s.size:
-                logger.warning("Address block size mismatch: %s != %s", ab_c.size, ab_s.size)
-                return False
+        if len(address_blocks_c) != len(address_blocks_s):
+            return self._log_count_mismatch("Address blocks", address_blocks_c, address_blocks_s)
 
-            if ab_c.usage != ab_s.usage:
-                logger.warning("Address block usage mismatch: %s != %s", ab_c.usage, ab_s.usage)
-                return False
+        for ab_c, ab_s in zip(address_blocks_c, address_blocks_s):
+            if _address_block_key(ab_c) != _address_block_key(ab_s):
+                return self._log_attribute_mismatch("Address block", _ADDRESS_BLOCK_ATTRIBUTES, ab_c, ab_s)
 
-            if ab_c.protection != ab_s.protection:
-                logger.warning("Address block protection mismatch: %s != %s", ab_c.protection, ab_s.protection)
-                return False
-
-        return True
+        return False
 
     def _compare_interrupts(self, interrupts_c: list[Interrupt], interrupts_s: list[Interrupt]) -> bool:
-        for int_c, int_s in zip(interrupts_c, interrupts_s):
-            if int_c.name != int_s.name:
-                logger.warning("Interrupt name mismatch: %s != %s", int_c.name, int_s.name)
-                return False
+        if list(map(_interrupt_key, interrupts_c)) == list(map(_interrupt_key, interrupts_s)):
+            return True
 
-            if int_c.value != int_s.value:
-                logger.warning("Interrupt value mismatch: %s != %s", int_c.value, int_s.value)
-                return False
+        if len(interrupts_c) != len(interrupts_s):
+            return self._log_count_mismatch("Interrupts", interrupts_c, interrupts_s)
 
-        return True
+        for int_c, int_s in zip(interrupts_c, interrupts_s):
+            if _interrupt_key(int_c) != _interrupt_key(int_s):
+                return self._log_attribute_mismatch("Interrupt", _INTERRUPT_ATTRIBUTES, int_c, int_s)
+
+        return False
 
     def _compare_registers_clusters(
         self, registers_clusters_c: list[Register | Cluster], registers_clusters_s: list[Register | Cluster]
     ) -> bool:
-        for reg_cluster_c, reg_cluster_s in zip(registers_clusters_c, registers_clusters_s):
-            if isinstance(reg_cluster_c, Register) and isinstance(reg_cluster_s, Register):
-                if not self._compare_register(reg_cluster_c, reg_cluster_s):
-                    return False
-            elif isinstance(reg_cluster_c, Cluster) and isinstance(reg_cluster_s, Cluster):
-                if not self._compare_cluster(reg_cluster_c, reg_cluster_s):
+        # nested clusters are queued on a worklist instead of recursing through _compare_cluster
+        worklist = deque([(registers_clusters_c, registers_clusters_s)])
+        while worklist:
+            children_c, children_s = worklist.popleft()
+
+            pairs = self._pair_by_key("Registers clusters", children_c, children_s, _register_cluster_match_key)
+            if pairs is None:
+                return False
+
+            for reg_cluster_c, reg_cluster_s in pairs:
+                if self._tree_key(reg_cluster_c) == self._tree_key(reg_cluster_s):
+                    continue
+
+                if isinstance(reg_cluster_c, Register) and isinstance(reg_cluster_s, Register):
+                    if not self._compare_register(reg_cluster_c, reg_cluster_s):
+                        return False
+                elif isinstance(reg_cluster_c, Cluster) and isinstance(reg_cluster_s, Cluster):
+                    if not self._compare_cluster(reg_cluster_c, reg_cluster_s):
+                        return False
+
+                    worklist.append((reg_cluster_c.registers_clusters, reg_cluster_s.registers_clusters))
+                else:
+                    if logger.isEnabledFor(logging.WARNING):
+                        _warn("Register/Cluster type mismatch: %s != %s", type(reg_cluster_c), type(reg_cluster_s))
                     return False
-            else:
-                logger.warning("Register/Cluster type mismatch: %s != %s", type(reg_cluster_c), type(reg_cluster_s))
-                return False
 
         return True
 
     def _compare_register(self, register_c: Register, register_s: Register) -> bool:
-        if register_c.name != register_s.name:
-            logger.warning("Register name mismatch: %s != %s", register_c.name, register_s.name)
-            return False
-
-        if register_c.display_name != register_s.display_name:
-            logger.warning("Register display name mismatch: %s != %s", register_c.display_name, register_s.display_name)
-            return False
-
-        if register_c.alternate_group != register_s.alternate_group:
-            logger.warning(
-                "Register alternate group mismatch: %s != %s", register_c.alternate_group, register_s.alternate_group
-            )
-            return False
-
-        if register_c.alternate_register != register_s.alternate_register:
-            logger.warning(
-                "Register alternate register mismatch: %s != %s",
-                register_c.alternate_register,
-                register_s.alternate_register,
-            )
-            return False
-
-        if register_c.address_offset != register_s.address_offset:
-            logger.warning(
-                "Register address offset mismatch: %s != %s", register_c.address_offset, register_s.address_offset
-            )
-            return False
-
-        if register_c.data_type != register_s.data_type:
-            logger.warning("Register data type mismatch: %s != %s", register_c.data_type, register_s.data_type)
-            return False
-
-        if register_c.modified_write_values != register_s.modified_write_values:
-            logger.warning(
-                "Register modified write values mismatch: %s != %s",
-                register_c.modified_write_values,
-                register_s.modified_write_values,
-            )
-            return False
-
-        if register_c.read_action != register_s.read_action:
-            logger.warning("Register read action mismatch: %s != %s", register_c.read_action, register_s.read_action)
-            return False
-
-        if register_c.size != register_s.size:
-            logger.warning("Register size mismatch: %s != %s", register_c.size, register_s.size)
-            return False
-
-        if register_c.access != register_s.access:
-            logger.warning("Register access mismatch: %s != %s", register_c.access, register_s.access)
-            return False
-
-        if register_c.protection != register_s.protection:
-            logger.warning("Register protection mismatch: %s != %s", register_c.protection, register_s.protection)
-            return False
-
-        # Can't compare reset values and masks do to a bug in svdconv
-
-        # if register_c.reset_value != register_s.reset_value:
-        #     logger.warning("Register reset value mismatch: %s != %s", register_c.reset_value, register_s.reset_value)
-        #     return False
-
-        # if register_c.reset_mask != register_s.reset_mask:
-        #     logger.warning("Register reset mask mismatch: %s != %s", register_c.reset_mask, register_s.reset_mask)
-        #     return False
-
-        if len(register_c.fields) != len(register_s.fields):
-            logger.warning("Fields count mismatch: %s != %s", len(register_c.fields), len(register_s.fields))
-            return False
+        if _register_key(register_c) != _register_key(register_s):
+            return self._log_attribute_mismatch("Register", _REGISTER_ATTRIBUTES, register_c, register_s)
 
         if not self._compare_fields(register_c.fields, register_s.fields):
             return False
 
-        if register_c.base_address != register_s.base_address:
-            logger.warning("Register base address mismatch: %s != %s", register_c.base_address, register_s.base_address)
-            return False
-
         return True
 
     def _compare_cluster(self, cluster_c: Cluster, cluster_s: Cluster) -> bool:
-        if cluster_c.name != cluster_s.name:
-            logger.warning("Cluster name mismatch: %s != %s", cluster_c.name, cluster_s.name)
-            return False
-
-        if cluster_c.alternate_cluster != cluster_s.alternate_cluster:
-            logger.warning(
-                "Cluster alternate cluster mismatch: %s != %s", cluster_c.alternate_cluster, cluster_s.alternate_cluster
-            )
-            return False
-
-        # bug in SVDConv?
-        # if cluster_c.header_struct_name != cluster_s.header_struct_name:
-        #     logger.warning(
-        #         "Cluster header struct name mismatch: %s != %s",
-        #         cluster_c.header_struct_name,
-        #         cluster_s.header_struct_name,
-        #     )
-        #     return False
-
-        if cluster_c.address_offset != cluster_s.address_offset:
-            logger.warning(
-                "Cluster address offset mismatch: %s != %s", cluster_c.address_offset, cluster_s.address_offset
-            )
-            return False
-
-        if cluster_c.size != cluster_s.size:
-            logger.warning("Cluster size mismatch: %s != %s", cluster_c.size, cluster_s.size)
-            return False
-
-        if cluster_c.access != cluster_s.access:
-            logger.warning("Cluster access mismatch: %s != %s", cluster_c.access, cluster_s.access)
-            return False
-
-        if cluster_c.protection != cluster_s.protection:
-            logger.warning("Cluster protection mismatch: %s != %s", cluster_c.protection, cluster_s.protection)
-            return False
-
-        if cluster_c.reset_value != cluster_s.reset_value:
-            logger.warning("Cluster reset value mismatch: %s != %s", cluster_c.reset_value, cluster_s.reset_value)
-            return False
-
-        if cluster_c.reset_mask != cluster_s.reset_mask:
-            logger.warning("Cluster reset mask mismatch: %s != %s", cluster_c.reset_mask, cluster_s.reset_mask)
-            return False
-
-        if len(cluster_c.registers_clusters) != len(cluster_s.registers_clusters):
-            logger.warning(
-                "Registers clusters count mismatch: %s != %s",
-                len(cluster_c.registers_clusters),
-                len(cluster_s.registers_clusters),
-            )
-            return False
-
-        if not self._compare_registers_clusters(cluster_c.registers_clusters, cluster_s.registers_clusters):
-            return False
-
-        if cluster_c.base_address != cluster_s.base_address:
-            logger.warning("Cluster base address mismatch: %s != %s", cluster_c.base_address, cluster_s.base_address)
-            return False
+        if _cluster_key(cluster_c) != _cluster_key(cluster_s):
+            return self._log_attribute_mismatch("Cluster", _CLUSTER_ATTRIBUTES, cluster_c, cluster_s)
 
+        # the children are compared by _compare_registers_clusters
         return True
 
     def _compare_fields(self, fields_c: list[Field], fields_s: list[Field]) -> bool:
-        for field_c, field_s in zip(fields_c, fields_s):
-            if field_c.name != field_s.name:
-                logger.warning("Field name mismatch: %s != %s", field_c.name, field_s.name)
-                return False
-
-            if field_c.lsb != field_s.lsb:
-                logger.warning("Field lsb mismatch: %s != %s", field_c.lsb, field_s.lsb)
-                return False
-
-            if field_c.msb != field_s.msb:
-                logger.warning("Field msb mismatch: %s != %s", field_c.msb, field_s.msb)
-                return False
-
-            if field_c.bit_offset != field_s.bit_offset:
-                logger.warning("Field bit offset mismatch: %s != %s", field_c.bit_offset, field_s.bit_offset)
-                return False
-
-            if field_c.bit_width != field_s.bit_width:
-                logger.warning("Field bit width mismatch: %s != %s", field_c.bit_width, field_s.bit_width)
-                return False
-
-            if field_c.bit_range != field_s.bit_range:
-                logger.warning("Field bit range mismatch: %s != %s", field_c.bit_range, field_s.bit_range)
-                return False
-
-            if field_c.modified_write_values != field_s.modified_write_values:
-                logger.warning(
-                    "Field modified write values mismatch: %s != %s",
-                    field_c.modified_write_values,
-                    field_s.modified_write_values,
-                )
-                return False
+        pairs = self._pair_by_key("Fields", fields_c, fields_s, _field_match_key)
+        if pairs is None:
+            return False
 
-            if field_c.read_action != field_s.read_action:
-                logger.warning("Field read action mismatch: %s != %s", field_c.read_action, field_s.read_action)
-                return False
+        for field_c, field_s in pairs:
+            if self._tree_key(field_c) == self._tree_key(field_s):
+                continue
 
-            if field_c.access != field_s.access:
-                logger.warning("Field access mismatch: %s != %s", field_c.access, field_s.access)
-                return False
-
-            if len(field_c.enumerated_value_containers) != len(field_s.enumerated_value_containers):
-                logger.warning(
-                    "Enumerated value containers count mismatch: %s != %s",
-                    len(field_c.enumerated_value_containers),
-                    len(field_s.enumerated_value_containers),
-                )
-                return False
+            if _field_key(field_c) != _field_key(field_s):
+                return self._log_attribute_mismatch("Field", _FIELD_ATTRIBUTES, field_c, field_s)
 
             if not self._compare_enumerated_value_containers(
                 field_c.enumerated_value_containers, field_s.enumerated_value_containers
@@ -369,30 +338,18 @@ class Compare:
     def _compare_enumerated_value_containers(
         self, evcs_c: list[EnumeratedValueContainer], evcs_s: list[EnumeratedValueContainer]
     ) -> bool:
-        for evc_c, evc_s in zip(evcs_c, evcs_s):
-            if evc_c.name != evc_s.name:
-                logger.warning("Enumerated value container name mismatch: %s != %s", evc_c.name, evc_s.name)
-                return False
-
-            if evc_c.header_enum_name != evc_s.header_enum_name:
-                logger.warning(
-                    "Enumerated value container header enum name mismatch: %s != %s",
-                    evc_c.header_enum_name,
-                    evc_s.header_enum_name,
-                )
-                return False
+        pairs = self._pair_by_key("Enumerated value containers", evcs_c, evcs_s, _enumerated_value_container_match_key)
+        if pairs is None:
+            return False
 
-            if evc_c.usage != evc_s.usage:
-                logger.warning("Enumerated value container usage mismatch: %s != %s", evc_c.usage, evc_s.usage)
-                return False
+        for evc_c, evc_s in pairs:
+            if self._tree_key(evc_c) == self._tree_key(evc_s):
+                continue
 
-            if len(evc_c.enumerated_values) != len(evc_s.enumerated_values):
-                logger.warning(
-                    "Enumerated values count mismatch: %s != %s",
-                    len(evc_c.enumerated_values),
-                    len(evc_s.enumerated_values),
+            if _enumerated_value_container_key(evc_c) != _enumerated_value_container_key(evc_s):
+                return self._log_attribute_mismatch(
+                    "Enumerated value container", _ENUMERATED_VALUE_CONTAINER_ATTRIBUTES, evc_c, evc_s
                 )
-                return False
 
             if not self._compare_enumerated_values(evc_c.enumerated_values, evc_s.enumerated_values):
                 return False
@@ -400,13 +357,15 @@ class Compare:
         return True
 
     def _compare_enumerated_values(self, evs_c: list[EnumeratedValue], evs_s: list[EnumeratedValue]) -> bool:
-        for ev_c, ev_s in zip(evs_c, evs_s):
-            if ev_c.name != ev_s.name:
-                logger.warning("Enumerated value name mismatch: %s != %s", ev_c.name, ev_s.name)
-                return False
+        # the key tuples of the whole list are built and compared in C; the loop below only locates the difference
+        if list(map(_enumerated_value_key, evs_c)) == list(map(_enumerated_value_key, evs_s)):
+            return True
 
-            if ev_c.value != ev_s.value:
-                logger.warning("Enumerated value value mismatch: %s != %s", ev_c.value, ev_s.value)
-                return False
+        if len(evs_c) != len(evs_s):
+            return self._log_count_mismatch("Enumerated values", evs_c, evs_s)
 
-        return True
+        for ev_c, ev_s in zip(evs_c, evs_s):
+            if _enumerated_value_key(ev_c) != _enumerated_value_key(ev_s):
+                return self._log_attribute_mismatch("Enumerated value", _ENUMERATED_VALUE_ATTRIBUTES, ev_c, ev_s)
+
+        return False
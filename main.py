@@ -1,37 +1,47 @@
+import os
 import logging
 import argparse
-import pathlib
-import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from svdsuite import Process
 
-from svdconv.parser import parse_svdconv_output
+from svdconv.parser import parse_svdconv_output, DefaultEnumTooWideError
+from svdconv.cache import parse_svdconv_output_cached, DEFAULT_CACHE_DIR
 from compare import Compare
 
-ACCEPTED_DIFFERENCES = [
-    # svd content: <peripheral derivedFrom="DMA1"><name>DMA2</name><description/><groupName/>
-    # SVDConv wrongly accepts <groupName/> as a valid group name and doesn't inherhit the real group name from DMA1
-    {"vendor": "Geehy", "name": "APM32E1xx_DFP", "version": "1.0.0", "svd_name": "APM32E103xx"},
-    #
-    # contains register with <dim>4</dim> but name doesn't contain %s
-    # SVDConv ignores this register, SVDSuite removes the <dim> tag
-    {"vendor": "Maxim", "name": "MAX32570", "version": "0.3.0", "svd_name": "max32570"},
-    #
-    # contains register with <dim>4</dim> but name doesn't contain %s
-    # SVDConv ignores this register, SVDSuite removes the <dim> tag
-    {"vendor": "Maxim", "name": "MAX32655", "version": "1.0.0", "svd_name": "max32655"},
-    #
-    # contains register with <dim>4</dim> but name doesn't contain %s
-    # SVDConv ignores this register, SVDSuite removes the <dim> tag
-    {"vendor": "Maxim", "name": "MAX32670", "version": "1.0.3", "svd_name": "max32670"},
-    #
-    # contains register with <dim>4</dim> but name doesn't contain %s
-    # SVDConv ignores this register, SVDSuite removes the <dim> tag
-    {"vendor": "Maxim", "name": "MAX32675", "version": "1.2.0", "svd_name": "max32675"},
-]
-
-
-@dataclass
+# (vendor, name, version, svd_name)
+# files are processed concurrently, so every log line is tagged with its worker process to tell the files apart; each
+# worker processes one file at a time, starting with its "Processing <path>" line
+LOG_FORMAT = "%(levelname)s:%(processName)s:%(name)s:%(message)s"
+
+ACCEPTED_DIFFERENCES = frozenset(
+    {
+        # svd content: <peripheral derivedFrom="DMA1"><name>DMA2</name><description/><groupName/>
+        # SVDConv wrongly accepts <groupName/> as a valid group name and doesn't inherhit the real group name from DMA1
+        ("Geehy", "APM32E1xx_DFP", "1.0.0", "APM32E103xx"),
+        #
+        # contains register with <dim>4</dim> but name doesn't contain %s
+        # SVDConv ignores this register, SVDSuite removes the <dim> tag
+        ("Maxim", "MAX32570", "0.3.0", "max32570"),
+        #
+        # contains register with <dim>4</dim> but name doesn't contain %s
+        # SVDConv ignores this register, SVDSuite removes the <dim> tag
+        ("Maxim", "MAX32655", "1.0.0", "max32655"),
+        #
+        # contains register with <dim>4</dim> but name doesn't contain %s
+        # SVDConv ignores this register, SVDSuite removes the <dim> tag
+        ("Maxim", "MAX32670", "1.0.3", "max32670"),
+        #
+        # contains register with <dim>4</dim> but name doesn't contain %s
+        # SVDConv ignores this register, SVDSuite removes the <dim> tag
+        ("Maxim", "MAX32675", "1.2.0", "max32675"),
+    }
+)
+
+
+@dataclass(slots=True, frozen=True)
 class SVDMeta:
     path: str
     vendor: str
@@ -40,82 +50,144 @@ class SVDMeta:
     svd: str
 
 
-def valid_svd_dir_or_file(arg: str) -> list[SVDMeta]:
-    abs_path = pathlib.Path(arg).absolute()
+def iter_svd_paths(root: str) -> Iterator[str]:
+    # os.walk is based on os.scandir, which provides the file type with the directory entries, so no extra stat call is
+    # needed per file
+    for dir_path, _, file_names in os.walk(root):
+        for file_name in file_names:
+            if file_name.endswith(".svd"):
+                yield os.path.join(dir_path, file_name)
 
-    svd_paths: list[str] = []
-    if abs_path.is_dir():
-        svd_paths = [file.absolute().as_posix() for file in abs_path.rglob("*.svd")]
 
-    if abs_path.is_file() and abs_path.suffix == ".svd":
-        svd_paths = [abs_path.absolute().as_posix()]
+def valid_svd_dir_or_file(arg: str) -> str:
+    abs_path = os.path.abspath(arg)
 
-    if not svd_paths:
-        raise argparse.ArgumentTypeError("given path is not valid or does not contain any svd files")
+    if os.path.isdir(abs_path) or (os.path.isfile(abs_path) and abs_path.endswith(".svd")):
+        return abs_path
+
+    raise argparse.ArgumentTypeError("given path is not a directory or svd file")
+
+
+def iter_svd_meta(abs_path: str) -> Iterator[SVDMeta]:
+    # svd files are yielded while the directory is walked, so processing starts before the walk is finished
+    svd_paths = iter_svd_paths(abs_path) if os.path.isdir(abs_path) else iter([abs_path])
 
-    svd_meta: list[SVDMeta] = []
     for svd_path in svd_paths:
-        pattern = r"^.*/(?P<vendor>[^/.]+)\.(?P<name>[^/.]+)\.(?P<version>[^/]+)/(?P<svd_name>[^/]+)\.svd$"
+        # <path_to_svd_dir>/<vendor>.<name>.<version>/<svd_name>.svd
+        pack_dir, svd_file = os.path.split(svd_path)
+        pack_parts = os.path.basename(pack_dir).split(".", 2)
+        svd_name = svd_file.removesuffix(".svd")
 
-        match = re.match(pattern, svd_path)
-        if match:
-            vendor = match.group("vendor")
-            name = match.group("name")
-            version = match.group("version")
-            svd_name = match.group("svd_name")
+        if len(pack_parts) != 3 or not all(pack_parts) or not svd_name:
+            raise ValueError(f"can't extract vendor, name, version and svd name from {svd_path}")
 
-            svd_meta.append(SVDMeta(path=svd_path, vendor=vendor, name=name, version=version, svd=svd_name))
-        else:
-            raise argparse.ArgumentTypeError(f"can't extract vendor, name, version and svd name from {svd_path}")
+        vendor, name, version = pack_parts
 
-    return svd_meta
+        yield SVDMeta(path=svd_path, vendor=vendor, name=name, version=version, svd=svd_name)
 
 
 def is_accepted_difference(svd_meta: SVDMeta) -> bool:
-    for accepted_diff in ACCEPTED_DIFFERENCES:
-        if (
-            accepted_diff["vendor"] == svd_meta.vendor
-            and accepted_diff["name"] == svd_meta.name
-            and accepted_diff["version"] == svd_meta.version
-            and accepted_diff["svd_name"] == svd_meta.svd
-        ):
-            return True
+    return (svd_meta.vendor, svd_meta.name, svd_meta.version, svd_meta.svd) in ACCEPTED_DIFFERENCES
+
+
+def init_worker() -> None:
+    # forked workers inherit the logging setup of main(), spawned ones need their own
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+
+def process_svd(svd_meta: SVDMeta, cache_dir: None | str, skip_accepted: bool) -> bool:
+    # returns False if svdconv and svdsuite differ and the difference is not accepted
+    if skip_accepted and is_accepted_difference(svd_meta):
+        logging.info("Skipping %s because its differences are accepted\n\n", svd_meta.path)
+        return True
+
+    logging.info("Processing %s", svd_meta.path)
+
+    try:
+        if cache_dir is None:
+            svdconv_peripherals = parse_svdconv_output(svd_meta.path)
+        else:
+            svdconv_peripherals = parse_svdconv_output_cached(svd_meta.path, cache_dir)
+    except DefaultEnumTooWideError as e:
+        # svdsuite expands the default enumerated value the same way, so the file is skipped before it runs out of
+        # memory as well
+        logging.warning("Processing of %s was skipped: %s\n\n", svd_meta.path, e)
+        return True
 
-    return False
+    if svdconv_peripherals is None:
+        logging.info(
+            "Processing of %s was canceled because the file could not be parsed with svdconv\n\n", svd_meta.path
+        )
+        return True
+
+    svdsuite_peripherals = Process.from_svd_file(svd_meta.path).get_processed_device().peripherals
+    compare = Compare(svdconv_peripherals, svdsuite_peripherals)
+
+    if not compare.compare():
+        logging.error("Found differences between svdconv and svdsuite for %s", svd_meta.path)
+
+        if not is_accepted_difference(svd_meta):
+            return False
+
+    logging.info("Finished processing %s\n\n", svd_meta.path)
+    return True
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument(
-        dest="svd_meta_list",
+        dest="svd_path",
         help="path to single svd file or directory containing svd files",
         type=valid_svd_dir_or_file,
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help=f"directory for caching the parsed svdconv output (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="always run svdconv and don't cache its output")
+    parser.add_argument(
+        "--skip-accepted",
+        action="store_true",
+        help="skip svd files with accepted differences instead of running svdconv and svdsuite on them",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of svd files processed in parallel (default: number of cpus)",
+    )
     args = parser.parse_args()
 
-    logging.basicConfig(level=logging.INFO)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("argument -j/--jobs: must be at least 1")
 
-    for svd_meta in args.svd_meta_list:
-        logging.info("Processing %s", svd_meta.path)
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 
-        svdconv_peripherals = parse_svdconv_output(svd_meta.path)
+    process = partial(
+        process_svd, cache_dir=None if args.no_cache else args.cache_dir, skip_accepted=args.skip_accepted
+    )
 
-        if svdconv_peripherals is None:
-            logging.info(
-                "Processing of %s was canceled because the file could not be parsed with svdconv\n\n", svd_meta.path
-            )
-            continue
+    processed = 0
 
-        svdsuite_peripherals = Process.from_svd_file(svd_meta.path).get_processed_device().peripherals
-        compare = Compare(svdconv_peripherals, svdsuite_peripherals)
+    # every svd file is processed independently, so the files are distributed over worker processes
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker) as executor:
+        try:
+            results = executor.map(process, iter_svd_meta(args.svd_path), chunksize=4)
+        except ValueError as e:
+            executor.shutdown(cancel_futures=True)
+            parser.error(str(e))
 
-        if not compare.compare():
-            logging.error("Found differences between svdconv and svdsuite for %s", svd_meta.path)
+        for success in results:
+            processed += 1
 
-            if not is_accepted_difference(svd_meta):
+            if not success:
+                executor.shutdown(cancel_futures=True)
                 raise SystemExit(1)
 
-        logging.info("Finished processing %s\n\n", svd_meta.path)
+    if processed == 0:
+        parser.error("given path does not contain any svd files")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+import os
+import hashlib
+import importlib.metadata
+import logging
+import pickle
+import tempfile
+from functools import cache
+
+from svdsuite.model.process import Peripheral
+
+from svdconv import parser
+from svdconv.parser import parse_svdconv_output, SVDCONV_BINARY
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "svdsuite-svdconv-compare"
+)
+
+
+@cache
+def _get_toolchain_key() -> str:
+    # cached results depend on the svdconv build, on the parser and on the svdsuite model classes they are pickled
+    # as, so a change of any of them invalidates all entries. The binary itself is hashed, because its --version only
+    # names the devtools commit and stays the same when it is rebuilt with a changed devtools.patch
+    toolchain_hash = hashlib.blake2b(digest_size=8)
+
+    for path in (SVDCONV_BINARY, parser.__file__):
+        with open(path, "rb") as f:
+            toolchain_hash.update(f.read())
+
+    toolchain_hash.update(importlib.metadata.version("svdsuite").encode())
+
+    return toolchain_hash.hexdigest()
+
+
+def parse_svdconv_output_cached(svd_path: str, cache_dir: str = DEFAULT_CACHE_DIR) -> None | list[Peripheral]:
+    with open(svd_path, "rb") as f:
+        svd_key = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    toolchain_cache_dir = os.path.join(cache_dir, _get_toolchain_key())
+    cache_path = os.path.join(toolchain_cache_dir, f"{svd_key}.pkl")
+
+    try:
+        with open(cache_path, "rb") as f:
+            cached: None | list[Peripheral] = pickle.load(f)
+            return cached
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # damaged or incompatible entries are treated as a miss and rewritten below; besides UnpicklingError, loading
+        # them can raise about anything (EOFError, AttributeError, ImportError, ValueError, ...)
+        logger.warning("Ignoring unreadable cache entry %s: %s", cache_path, e)
+
+    # files svdconv reports errors for are cached as None as well
+    peripherals = parse_svdconv_output(svd_path)
+
+    try:
+        _write_cache_entry(toolchain_cache_dir, cache_path, peripherals)
+    except OSError as e:
+        # the cache is only an optimization, an unwritable cache directory must not fail the run
+        logger.warning("Could not write cache entry %s: %s", cache_path, e)
+
+    return peripherals
+
+
+def _write_cache_entry(toolchain_cache_dir: str, cache_path: str, peripherals: None | list[Peripheral]) -> None:
+    os.makedirs(toolchain_cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=toolchain_cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(peripherals, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
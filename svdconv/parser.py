@@ -2,14 +2,19 @@ import os
 import logging
 import subprocess
 import re
-import json
 from typing import Any
+from operator import attrgetter, itemgetter
+from functools import cache
+
+try:
+    from orjson import loads as json_loads  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # orjson is optional, it only speeds up decoding the svdconv output
+    from json import loads as json_loads  # type: ignore[assignment, unused-ignore]
 
 from svdsuite.model.process import (
     Peripheral,
     Field,
     EnumeratedValueContainer,
-    IEnumeratedValue,
     EnumeratedValue,
     AddressBlock,
     Register,
@@ -28,158 +33,178 @@ from svdsuite.model.types import (
 
 logger = logging.getLogger(__name__)
 
+SVDCONV_BINARY = os.path.join(os.path.dirname(__file__), "svdconv")
+
+# a default enumerated value is expanded to every value of the field that is not covered otherwise, which doesn't fit
+# into memory for wide fields (svdsuite expands it the same way)
+_MAX_DEFAULT_ENUM_WIDTH = 20
+
+
+class DefaultEnumTooWideError(ValueError):
+    pass
+
+
+_ERROR_WARNING_STATS_PATTERN = re.compile(rb"Found (\d+) Error\(s\) and (\d+) Warning\(s\)")
+
+
+_ACCESS_TYPES = {
+    "READ_ONLY": AccessType.READ_ONLY,
+    "WRITE_ONLY": AccessType.WRITE_ONLY,
+    "READ_WRITE": AccessType.READ_WRITE,
+    "WRITE_ONCE": AccessType.WRITE_ONCE,
+    "READ_WRITE_ONCE": AccessType.READ_WRITE_ONCE,
+}
+
+_PROTECTION_TYPES = {
+    "UNDEF": ProtectionStringType.ANY,
+    "SECURE": ProtectionStringType.SECURE,
+    "NONSECURE": ProtectionStringType.NON_SECURE,
+    "PRIVILEGED": ProtectionStringType.PRIVILEGED,
+}
+
+_ADDR_BLOCK_USAGES = {
+    "REGISTERS": EnumeratedTokenType.REGISTERS,
+    "BUFFER": EnumeratedTokenType.BUFFER,
+    "RESERVED": EnumeratedTokenType.RESERVED,
+}
+
+_MODIFIED_WRITE_VALUES = {
+    "undefined": ModifiedWriteValuesType.MODIFY,
+    "oneToClear": ModifiedWriteValuesType.ONE_TO_CLEAR,
+    "oneToSet": ModifiedWriteValuesType.ONE_TO_SET,
+    "oneToToggle": ModifiedWriteValuesType.ONE_TO_TOGGLE,
+    "zeroToClear": ModifiedWriteValuesType.ZERO_TO_CLEAR,
+    "zeroToSet": ModifiedWriteValuesType.ZERO_TO_SET,
+    "zeroToToggle": ModifiedWriteValuesType.ZERO_TO_TOGGLE,
+    "clear": ModifiedWriteValuesType.CLEAR,
+    "set": ModifiedWriteValuesType.SET,
+    "modify": ModifiedWriteValuesType.MODIFY,
+}
+
+_READ_ACTIONS = {
+    "UNDEF": None,
+    "CLEAR": ReadActionType.CLEAR,
+    "SET": ReadActionType.SET,
+    "MODIFY": ReadActionType.MODIFY,
+    "MODIFEXT": ReadActionType.MODIFY_EXTERNAL,
+}
+
+# keys are lower case, the data type is matched case insensitive
+_DATA_TYPES = {
+    "": None,
+    "uint8_t": DataTypeType.UINT8_T,
+    "uint16_t": DataTypeType.UINT16_T,
+    "uint32_t": DataTypeType.UINT32_T,
+    "uint64_t": DataTypeType.UINT64_T,
+    "int8_t": DataTypeType.INT8_T,
+    "int16_t": DataTypeType.INT16_T,
+    "int32_t": DataTypeType.INT32_T,
+    "int64_t": DataTypeType.INT64_T,
+    "uint8_t *": DataTypeType.UINT8_T_PTR,
+    "uint16_t *": DataTypeType.UINT16_T_PTR,
+    "uint32_t *": DataTypeType.UINT32_T_PTR,
+    "uint64_t *": DataTypeType.UINT64_T_PTR,
+    "int8_t *": DataTypeType.INT8_T_PTR,
+    "int16_t *": DataTypeType.INT16_T_PTR,
+    "int32_t *": DataTypeType.INT32_T_PTR,
+    "int64_t *": DataTypeType.INT64_T_PTR,
+}
+
+_ENUM_USAGES = {
+    "UNDEF": EnumUsageType.READ_WRITE,
+    "READ": EnumUsageType.READ,
+    "WRITE": EnumUsageType.WRITE,
+    "READWRITE": EnumUsageType.READ_WRITE,
+}
+
 
 def _get_access_type(access: str) -> AccessType:
-    if access == "UNDEF":
-        raise NotImplementedError
-    elif access == "READ_ONLY":
-        return AccessType.READ_ONLY
-    elif access == "WRITE_ONLY":
-        return AccessType.WRITE_ONLY
-    elif access == "READ_WRITE":
-        return AccessType.READ_WRITE
-    elif access == "WRITE_ONCE":
-        return AccessType.WRITE_ONCE
-    elif access == "READ_WRITE_ONCE":
-        return AccessType.READ_WRITE_ONCE
-    elif access == "END":
-        raise NotImplementedError
-    else:
-        raise NotImplementedError
+    try:
+        return _ACCESS_TYPES[access]
+    except KeyError:
+        raise NotImplementedError(f"No matching AccessType for: {access}") from None
 
 
 def _get_protection_type(protection: str) -> ProtectionStringType:
-    if protection == "UNDEF":
-        return ProtectionStringType.ANY
-    elif protection == "SECURE":
-        return ProtectionStringType.SECURE
-    elif protection == "NONSECURE":
-        return ProtectionStringType.NON_SECURE
-    elif protection == "PRIVILEGED":
-        return ProtectionStringType.PRIVILEGED
-    else:
-        raise NotImplementedError
+    try:
+        return _PROTECTION_TYPES[protection]
+    except KeyError:
+        raise NotImplementedError(f"No matching ProtectionStringType for: {protection}") from None
 
 
 def _get_addr_block_usage(usage: str) -> EnumeratedTokenType:
-    if usage == "UNDEF":
-        raise NotImplementedError(f"No matching AddrBlockUsage for: {usage}")
-    elif usage == "REGISTERS":
-        return EnumeratedTokenType.REGISTERS
-    elif usage == "BUFFER":
-        return EnumeratedTokenType.BUFFER
-    elif usage == "RESERVED":
-        return EnumeratedTokenType.RESERVED
-    else:
-        raise NotImplementedError(f"No matching AddrBlockUsage for: {usage}")
+    try:
+        return _ADDR_BLOCK_USAGES[usage]
+    except KeyError:
+        raise NotImplementedError(f"No matching AddrBlockUsage for: {usage}") from None
 
 
 def _get_modified_write_value(mod_write_val: str) -> ModifiedWriteValuesType:
-    if mod_write_val == "undefined":
-        return ModifiedWriteValuesType.MODIFY
-    elif mod_write_val == "oneToClear":
-        return ModifiedWriteValuesType.ONE_TO_CLEAR
-    elif mod_write_val == "oneToSet":
-        return ModifiedWriteValuesType.ONE_TO_SET
-    elif mod_write_val == "oneToToggle":
-        return ModifiedWriteValuesType.ONE_TO_TOGGLE
-    elif mod_write_val == "zeroToClear":
-        return ModifiedWriteValuesType.ZERO_TO_CLEAR
-    elif mod_write_val == "zeroToSet":
-        return ModifiedWriteValuesType.ZERO_TO_SET
-    elif mod_write_val == "zeroToToggle":
-        return ModifiedWriteValuesType.ZERO_TO_TOGGLE
-    elif mod_write_val == "clear":
-        return ModifiedWriteValuesType.CLEAR
-    elif mod_write_val == "set":
-        return ModifiedWriteValuesType.SET
-    elif mod_write_val == "modify":
-        return ModifiedWriteValuesType.MODIFY
-    else:
-        raise NotImplementedError(f"No matching ModifiedWriteValuesType for: {mod_write_val}")
+    try:
+        return _MODIFIED_WRITE_VALUES[mod_write_val]
+    except KeyError:
+        raise NotImplementedError(f"No matching ModifiedWriteValuesType for: {mod_write_val}") from None
 
 
 def _get_read_action(action: str) -> ReadActionType | None:
-    if action == "UNDEF":
-        return None
-    elif action == "CLEAR":
-        return ReadActionType.CLEAR
-    elif action == "SET":
-        return ReadActionType.SET
-    elif action == "MODIFY":
-        return ReadActionType.MODIFY
-    elif action == "MODIFEXT":
-        return ReadActionType.MODIFY_EXTERNAL
-    else:
-        raise NotImplementedError(f"No matching ReadActionType for: {action}")
+    try:
+        return _READ_ACTIONS[action]
+    except KeyError:
+        raise NotImplementedError(f"No matching ReadActionType for: {action}") from None
 
 
+# the data type is lowered before the lookup, so the few distinct spellings are cached
+@cache
 def _get_data_type(data_type: str) -> DataTypeType | None:
-    if data_type == "":
-        return None
-    elif data_type.lower() == "uint8_t":
-        return DataTypeType.UINT8_T
-    elif data_type.lower() == "uint16_t":
-        return DataTypeType.UINT16_T
-    elif data_type.lower() == "uint32_t":
-        return DataTypeType.UINT32_T
-    elif data_type.lower() == "uint64_t":
-        return DataTypeType.UINT64_T
-    elif data_type.lower() == "int8_t":
-        return DataTypeType.INT8_T
-    elif data_type.lower() == "int16_t":
-        return DataTypeType.INT16_T
-    elif data_type.lower() == "int32_t":
-        return DataTypeType.INT32_T
-    elif data_type.lower() == "int64_t":
-        return DataTypeType.INT64_T
-    elif data_type.lower() == "uint8_t *":
-        return DataTypeType.UINT8_T_PTR
-    elif data_type.lower() == "uint16_t *":
-        return DataTypeType.UINT16_T_PTR
-    elif data_type.lower() == "uint32_t *":
-        return DataTypeType.UINT32_T_PTR
-    elif data_type.lower() == "uint64_t *":
-        return DataTypeType.UINT64_T_PTR
-    elif data_type.lower() == "int8_t *":
-        return DataTypeType.INT8_T_PTR
-    elif data_type.lower() == "int16_t *":
-        return DataTypeType.INT16_T_PTR
-    elif data_type.lower() == "int32_t *":
-        return DataTypeType.INT32_T_PTR
-    elif data_type.lower() == "int64_t *":
-        return DataTypeType.INT64_T_PTR
-
-    raise NotImplementedError(f"No matching DataTypeType for: {data_type}")
+    try:
+        return _DATA_TYPES[data_type.lower()]
+    except KeyError:
+        raise NotImplementedError(f"No matching DataTypeType for: {data_type}") from None
 
 
 def _get_enum_usage(usage: str) -> EnumUsageType:
-    if usage == "UNDEF":
-        return EnumUsageType.READ_WRITE
-    elif usage == "READ":
-        return EnumUsageType.READ
-    elif usage == "WRITE":
-        return EnumUsageType.WRITE
-    elif usage == "READWRITE":
-        return EnumUsageType.READ_WRITE
-    else:
-        raise NotImplementedError(f"No matching EnumUsageType for: {usage}")
+    try:
+        return _ENUM_USAGES[usage]
+    except KeyError:
+        raise NotImplementedError(f"No matching EnumUsageType for: {usage}") from None
 
 
 class SVDConvParser:
-    def __init__(self, json_output: str) -> None:
+    def __init__(self, json_output: bytes) -> None:
         try:
-            self.data = json.loads(json_output)
-        except json.JSONDecodeError as e:
+            # without --quiet svdconv prints the peripheral array first, indented by 4, followed by an empty line and
+            # its messages ("Arguments: ...", the diagnostics and the "Found N Error(s) and M Warning(s)." summary). A
+            # non-empty array ends with the first line starting with "]", an empty one is printed as "[]" on one line
+            if json_output.startswith(b"[]"):
+                end = 2
+            else:
+                end = json_output.find(b"\n]")
+                end = end + 2 if end != -1 else len(json_output)
+
+            self.data = json_loads(json_output[:end])
+        except ValueError as e:  # json.JSONDecodeError, or UnicodeDecodeError as the output is not decoded up front
             logger.error("Failed to parse JSON output from svdconv: %s", e)
             self.data = None
 
+        self._parsed = False
+
     def parse(self) -> list[Peripheral]:
+        # parse() consumes the json tree, so a second call can't return the peripherals again
+        if self._parsed:
+            raise RuntimeError("SVDConvParser.parse() can only be called once")
+        self._parsed = True
+
         if self.data is None:
             return []
 
+        # the json tree is released peripheral by peripheral while it is converted, so it is not held in memory next
+        # to all converted peripherals. It is reversed once, so popping from the end keeps the svdconv order
+        data, self.data = self.data, None
+        data.reverse()
+
         peripherals: list[Peripheral] = []
-        for peripheral in self.data:
+        while data:
+            peripheral = data.pop()
             peripherals.append(
                 Peripheral(
                     name=peripheral["name"],
@@ -211,7 +236,8 @@ class SVDConvParser:
                 )
             )
 
-        return sorted(peripherals, key=lambda x: (x.base_address, x.name))
+        peripherals.sort(key=attrgetter("base_address", "name"))
+        return peripherals
 
     def _parse_address_blocks(self, address_blocks: list[dict[str, Any]]) -> list[AddressBlock]:
         result: list[AddressBlock] = []
@@ -226,7 +252,8 @@ class SVDConvParser:
                 )
             )
 
-        return sorted(result, key=lambda x: x.offset)
+        result.sort(key=attrgetter("offset"))
+        return result
 
     def _parse_interrupts(self, interrupts: list[dict[str, Any]]) -> list[Interrupt]:
         result: list[Interrupt] = []
@@ -240,26 +267,26 @@ class SVDConvParser:
                 )
             )
 
-        return sorted(result, key=lambda x: x.value)
+        result.sort(key=attrgetter("value"))
+        return result
 
     def _parse_registers_clusters(self, registers_clusters: list[dict[str, Any]]) -> list[Register | Cluster]:
-        def sort_key(reg_cluster: Cluster | Register) -> tuple[int, tuple[int, str], str]:
-            # Get alternate_group if it exists; default to None if not (e.g. for Clusters)
-            alt = getattr(reg_cluster, "alternate_group", None)
-            # If alt is None, return (0, '') so that None sorts before any string; else (1, alt)
-            alt_key = (0, "") if alt is None else (1, alt)
-            return (reg_cluster.base_address, alt_key, reg_cluster.name)
-
-        result: list[Register | Cluster] = []
+        # sort by base address, alternate group (None before any string; clusters have none) and name. The keys are
+        # built while parsing, as the type of each entry is known there
+        keyed: list[tuple[tuple[int, tuple[int, str], str], Register | Cluster]] = []
         for reg_cluster in registers_clusters:
             if reg_cluster["type"] == "register":
-                result.append(self._parse_register(reg_cluster))
+                register = self._parse_register(reg_cluster)
+                alt = register.alternate_group
+                keyed.append(((register.base_address, (0, "") if alt is None else (1, alt), register.name), register))
             elif reg_cluster["type"] == "cluster":
-                result.append(self._parse_cluster(reg_cluster))
+                cluster = self._parse_cluster(reg_cluster)
+                keyed.append(((cluster.base_address, (0, ""), cluster.name), cluster))
             else:
                 raise NotImplementedError(f"Unknown type: {reg_cluster['type']}")
 
-        return sorted(result, key=sort_key)
+        keyed.sort(key=itemgetter(0))
+        return [reg_cluster for _, reg_cluster in keyed]
 
     def _parse_register(self, register: dict[str, Any]) -> Register:
         return Register(
@@ -307,6 +334,7 @@ class SVDConvParser:
         for field in fields:
             bit_offset = field["bitOffset"]
             bit_width = field["bitWidth"]
+            msb = bit_offset + bit_width - 1
             result.append(
                 Field(
                     name=field["name"],
@@ -314,116 +342,107 @@ class SVDConvParser:
                     bit_offset=bit_offset,
                     bit_width=bit_width,
                     lsb=bit_offset,
-                    msb=bit_offset + bit_width - 1,
+                    msb=msb,
                     access=_get_access_type(field["access"]),
                     modified_write_values=_get_modified_write_value(field["modifiedWriteValues"]),
                     write_constraint=None,
                     read_action=_get_read_action(field["readAction"]),
                     enumerated_value_containers=self._parse_enum_value_containers(
-                        field["enumContainers"], bit_offset, bit_offset + bit_width - 1
+                        field["enumContainers"], bit_offset, msb
                     ),
-                    bit_range=(bit_offset + bit_width - 1, bit_offset),
+                    bit_range=(msb, bit_offset),
                     parsed=None,  # type: ignore
                 )
             )
 
-        return sorted(result, key=lambda x: (x.lsb, x.name))
+        result.sort(key=attrgetter("lsb", "name"))
+        return result
 
     def _parse_enum_value_containers(
         self, enum_containers: list[dict[str, Any]], lsb: int, msb: int
     ) -> list[EnumeratedValueContainer]:
         result: list[EnumeratedValueContainer] = []
         for enum_container in enum_containers:
-            enum_container_obj = EnumeratedValueContainer(
-                name=enum_container["name"] or None,
-                header_enum_name=enum_container["headerEnumName"] or None,
-                usage=_get_enum_usage(enum_container["usage"]),
-                enumerated_values=self._parse_enumerated_values(enum_container["enumeratedValues"], lsb, msb),
-                parsed=None,  # type: ignore
+            result.append(
+                EnumeratedValueContainer(
+                    name=enum_container["name"] or None,
+                    header_enum_name=enum_container["headerEnumName"] or None,
+                    usage=_get_enum_usage(enum_container["usage"]),
+                    enumerated_values=self._parse_enumerated_values(enum_container["enumeratedValues"], lsb, msb),
+                    parsed=None,  # type: ignore
+                )
             )
 
-            enum_container_obj.enumerated_values = sorted(enum_container_obj.enumerated_values, key=lambda x: x.value)
-
-            result.append(enum_container_obj)
-
         return sorted(result, key=lambda x: (x.usage.value, len(x.enumerated_values)))
 
     def _parse_enumerated_values(
         self, enumerated_values: list[dict[str, Any]], lsb: int, msb: int
     ) -> list[EnumeratedValue]:
-        default_enum = None
-        result: list[IEnumeratedValue] = []
+        default_name = None
+        result: list[EnumeratedValue] = []
         for enum_value in enumerated_values:
-            enum_obj = IEnumeratedValue(
-                name=enum_value["name"],
-                description=None,
-                value=int(enum_value["value"].replace("0b", ""), 2),
-                is_default=enum_value["isDefault"],
-                parsed=None,  # type: ignore
-            )
-
-            if enum_obj.is_default:
-                default_enum = enum_obj
-                enum_obj.value = None
-
-            result.append(enum_obj)
+            if enum_value["isDefault"]:
+                default_name = enum_value["name"]
+                continue
 
-        if default_enum is not None:
-            result = self._extend_enumerated_values_with_default(result, default_enum, lsb, msb)
-
-        enumerated_values_list: list[EnumeratedValue] = []
-        for enum_value in result:
-            if enum_value.value is None:
-                raise ValueError("Enumerated value is None")
+            result.append(
+                EnumeratedValue(
+                    name=enum_value["name"],
+                    description=None,
+                    value=int(enum_value["value"], 0),
+                    parsed=None,  # type: ignore
+                )
+            )
 
-            enumerated_values_list.append(EnumeratedValue.from_intermediate_enum_value(enum_value, enum_value.value))
+        if default_name is not None:
+            self._extend_enumerated_values_with_default(result, default_name, lsb, msb)
 
-        return enumerated_values_list
+        result.sort(key=attrgetter("value"))
+        return result
 
     def _extend_enumerated_values_with_default(
-        self, enumerated_values: list[IEnumeratedValue], default: IEnumeratedValue, lsb: int, msb: int
-    ) -> list[IEnumeratedValue]:
-        covered_values = {value.value for value in enumerated_values if value.value is not None}
-        all_possible_values = set(range(pow(2, msb - lsb + 1)))
+        self, enumerated_values: list[EnumeratedValue], default_name: str, lsb: int, msb: int
+    ) -> None:
+        width = msb - lsb + 1
+        if width > _MAX_DEFAULT_ENUM_WIDTH:
+            raise DefaultEnumTooWideError(
+                f"Can't expand default enumerated value {default_name} for a field of width {width}"
+            )
 
-        uncovered_values = all_possible_values - covered_values
+        covered_values = {value.value for value in enumerated_values}
+
+        for value in range(1 << width):
+            if value in covered_values:
+                continue
 
-        for value in uncovered_values:
             enumerated_values.append(
-                IEnumeratedValue(
-                    name=f"{default.name}_{value}",
+                EnumeratedValue(
+                    name=f"{default_name}_{value}",
                     description=None,
                     value=value,
-                    is_default=False,
-                    parsed=default.parsed,
+                    parsed=None,  # type: ignore
                 )
             )
 
-        return [value for value in enumerated_values if not value.is_default]
 
-
-def run_svdconv(svd_path: str, args: None | list[str] = None) -> str:
+def run_svdconv(svd_path: str, args: None | list[str] = None) -> bytes:
     if args is None:
         args = []
 
     result = subprocess.run(
-        [os.path.join(os.path.dirname(__file__), "svdconv"), svd_path] + args,
+        [SVDCONV_BINARY, svd_path] + args,
         capture_output=True,
-        text=True,
         check=False,
-        encoding="utf-8",
-        errors="replace",
     )
 
     return result.stdout
 
 
-def get_error_warning_stats(svd_path: str) -> tuple[int, int]:
-    pattern = r"Found (\d+) Error\(s\) and (\d+) Warning\(s\)"
-
-    output = run_svdconv(svd_path)
-
-    match = re.search(pattern, output)
+def get_error_warning_stats(output: bytes) -> tuple[int, int]:
+    # the summary is the last line of the svdconv output, so only the tail after the last "Found " is searched
+    match = _ERROR_WARNING_STATS_PATTERN.match(output, max(output.rfind(b"Found "), 0))
+    if match is None:
+        match = _ERROR_WARNING_STATS_PATTERN.search(output)
     if match:
         return int(match.group(1)), int(match.group(2))
     else:
@@ -431,13 +450,17 @@ def get_error_warning_stats(svd_path: str) -> tuple[int, int]:
 
 
 def parse_svdconv_output(svd_path: str) -> None | list[Peripheral]:
-    errors, _ = get_error_warning_stats(svd_path)
+    # a single svdconv run prints the json, followed by the messages and the error and warning summary
+    output = run_svdconv(svd_path, ["--debug-output-json"])
+
+    errors, _ = get_error_warning_stats(output)
 
     if errors > 0:
         logger.error("Found %d errors in svdconv output for %s", errors, svd_path)
         return None
 
-    json_output = run_svdconv(svd_path, ["--debug-output-json", "--quiet"])
-    parser = SVDConvParser(json_output)
+    parser = SVDConvParser(output)
+    # the decoded json replaces the raw output, which is not needed while the peripherals are converted
+    del output
 
     return parser.parse()